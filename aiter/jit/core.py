@@ -9,6 +9,7 @@ import multiprocessing
 import os
 import re
 import shutil
+import subprocess
 import sys
 import time
 import traceback
@@ -16,8 +17,6 @@ import types
 import typing
 from typing import Any, Callable, List, Optional
 
-from packaging.version import Version, parse
-
 this_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, f"{this_dir}/utils/")
 from chip_info import get_gfx, get_gfx_list
@@ -345,27 +344,84 @@ if multiprocessing.current_process().name == "MainProcess":
 # CK_DIR = f"{bd_dir}/ck"
 
 
+@functools.lru_cache(maxsize=1)
+def detect_local_archs():
+    """gfx archs of the GPUs actually present, [] when none can be detected."""
+    enumerator = "/opt/rocm/bin/rocm_agent_enumerator"
+    if not os.path.exists(enumerator):
+        enumerator = shutil.which("rocm_agent_enumerator")
+    if enumerator is None:
+        return []
+    try:
+        output = subprocess.check_output([enumerator], text=True)
+    except (OSError, subprocess.SubprocessError):
+        return []
+    archs = []
+    for arch in output.split():
+        # gfx000 is the CPU agent
+        if arch != "gfx000" and arch not in archs:
+            archs.append(arch)
+    return archs
+
+
 def validate_and_update_archs():
-    archs = os.getenv("GPU_ARCHS", "native").split(";")
-    archs = [arch.strip() for arch in archs]
     # List of allowed architectures
+    # (gfx940/gfx941 were pre-production parts, build gfx942 instead)
     allowed_archs = [
         "native",
         "gfx90a",
-        "gfx940",
-        "gfx941",
         "gfx942",
-        "gfx1100",
         "gfx950",
+        "gfx1100",
+        "gfx1101",
+        "gfx1102",
+        "gfx1201",
     ]
+    archs = os.getenv("GPU_ARCHS", "native").split(";")
+    archs = [arch.strip() for arch in archs]
+    local_archs = detect_local_archs()
+    if archs == ["native"] and local_archs:
+        # resolve "native" via rocm_agent_enumerator: --offload-arch=native
+        # fails outright on GPU-less build hosts
+        supported = [arch for arch in local_archs if arch in allowed_archs]
+        unsupported = [arch for arch in local_archs if arch not in allowed_archs]
+        if unsupported:
+            logger.warning(
+                f"local GPU archs {unsupported} are not in the supported list "
+                f"{allowed_archs}"
+            )
+        if supported:
+            archs = supported
+        # no supported local arch: keep the plain "native" passthrough
 
     # Validate if each element in archs is in allowed_archs
     assert all(
         arch in allowed_archs for arch in archs
     ), f"One of GPU archs of {archs} is invalid or not supported"
+    # warn (not assert) on archs without a local GPU so cross-compile still works
+    if local_archs:
+        non_local = [
+            arch for arch in archs if arch != "native" and arch not in local_archs
+        ]
+        if non_local:
+            logger.warning(
+                f"GPU archs {non_local} have no matching GPU on this machine "
+                f"(local: {local_archs}); their kernels cannot run here."
+            )
     return archs
 
 
+@functools.lru_cache(maxsize=1)
+def get_hip_version_tuple():
+    """HIP version as a plain int tuple, e.g. (6, 2, 41133).
+
+    Tuples compare directly, so the flag gates in build_module don't need
+    packaging.version at all.
+    """
+    version = get_hip_version().split()[-1].split("-")[0]
+    return tuple(int(x) for x in version.split(".")[:3])
+
+
 @functools.lru_cache()
 def hip_flag_checker(flag_hip: str) -> bool:
     ret = os.system(f"hipcc {flag_hip} -x hip -E -P /dev/null -o /dev/null")
@@ -376,13 +432,64 @@ def hip_flag_checker(flag_hip: str) -> bool:
         return False
 
 
-def check_and_set_ninja_worker():
-    max_num_jobs_cores = max(1, os.cpu_count() * 0.8)
+def get_effective_limits():
+    """Return (cores, free_memory_gb) honoring cgroup limits when present.
+
+    os.cpu_count() and psutil.virtual_memory() report host-wide numbers; in a
+    container (CI, docker, k8s) the cgroup cpu quota and memory limit are what
+    the scheduler and OOM killer actually enforce, so cap by those.
+    """
     import psutil
 
+    cores = os.cpu_count()
+    free_memory_gb = psutil.virtual_memory().available / (1024**3)
+
+    def read_limit(*paths):
+        for path in paths:
+            try:
+                with open(path) as f:
+                    return f.read().split()
+            except (OSError, ValueError):
+                continue
+        return None
+
+    # cgroup v2 "quota period", fall back to the two v1 files
+    cpu_max = read_limit("/sys/fs/cgroup/cpu.max")
+    if cpu_max is None:
+        quota = read_limit("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = read_limit("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if quota is not None and period is not None:
+            cpu_max = [quota[0], period[0]]
+    if cpu_max is not None and cpu_max[0] not in ("max", "-1"):
+        cores = min(cores, max(1, int(cpu_max[0]) // int(cpu_max[1])))
+
+    mem_limit = read_limit(
+        "/sys/fs/cgroup/memory.max",
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+    )
+    mem_used = read_limit(
+        "/sys/fs/cgroup/memory.current",
+        "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+    )
+    if mem_limit is not None and mem_limit[0] != "max":
+        used = int(mem_used[0]) if mem_used is not None else 0
+        free_memory_gb = min(
+            free_memory_gb, max(0, int(mem_limit[0]) - used) / (1024**3)
+        )
+
+    return cores, free_memory_gb
+
+
+def check_and_set_ninja_worker(num_archs=1):
+    cores, free_memory_gb = get_effective_limits()
+    # with -parallel-jobs, every compile job runs num_archs device passes at
+    # once, so scale its core and memory footprint accordingly
+    num_archs = max(1, num_archs)
+    max_num_jobs_cores = max(1, cores * 0.8 / num_archs)
+
     # calculate the maximum allowed NUM_JOBS based on free memory
-    free_memory_gb = psutil.virtual_memory().available / (1024**3)  # free memory in GB
-    max_num_jobs_memory = int(free_memory_gb / 0.5)  # assuming 0.5 GB per job
+    gb_per_job = float(os.environ.get("AITER_JOB_RSS_GB", "0.5")) * num_archs
+    max_num_jobs_memory = int(free_memory_gb / gb_per_job)
 
     # pick lower value of jobs based on cores vs memory metric to minimize oom and swap usage during compilation
     max_jobs = int(max(1, min(max_num_jobs_cores, max_num_jobs_memory)))
@@ -524,7 +631,6 @@ def build_module(
             "-D__HIP_PLATFORM_AMD__=1",
             "-U__HIP_NO_HALF_CONVERSIONS__",
             "-U__HIP_NO_HALF_OPERATORS__",
-            "-mllvm --amdgpu-kernarg-preload-count=16",
             # "-v --save-temps",
             "-Wno-unused-result",
             "-Wno-switch-bool",
@@ -536,21 +642,16 @@ def build_module(
         ]
 
         # Imitate https://github.com/ROCm/composable_kernel/blob/c8b6b64240e840a7decf76dfaa13c37da5294c4a/CMakeLists.txt#L190-L214
-        hip_version = parse(get_hip_version().split()[-1].rstrip("-").replace("-", "+"))
-        if hip_version <= Version("6.3.42132"):
+        hip_version = get_hip_version_tuple()
+        if hip_version <= (6, 3, 42132):
             flags_hip += ["-mllvm --amdgpu-enable-max-ilp-scheduling-strategy=1"]
-        if hip_version > Version("5.5.00000"):
+        if hip_version > (5, 5, 0):
             flags_hip += ["-mllvm --lsr-drop-solution=1"]
-        if hip_version > Version("5.7.23302"):
+        if hip_version > (5, 7, 23302):
             flags_hip += ["-fno-offload-uniform-block"]
-        if hip_version > Version("6.1.40090"):
+        if hip_version > (6, 1, 40090):
             flags_hip += ["-mllvm -enable-post-misched=0"]
-        if hip_version > Version("6.2.41132"):
-            flags_hip += [
-                "-mllvm -amdgpu-early-inline-all=true",
-                "-mllvm -amdgpu-function-calls=false",
-            ]
-        if hip_version > Version("6.2.41133"):
+        if hip_version > (6, 2, 41133):
             flags_hip += ["-mllvm -amdgpu-coerce-illegal-types=1"]
         if get_gfx() == "gfx950" and int(os.getenv("AITER_FP4x2", "1")) > 0:
             flags_hip += ["-D__Float4_e2m1fn_x2"]
@@ -565,9 +666,13 @@ def build_module(
         flags_hip += flags_extra_hip
         archs = validate_and_update_archs()
         flags_hip += [f"--offload-arch={arch}" for arch in archs]
+        if len(archs) > 1:
+            # a fat multi-arch compile runs the per-arch device passes serially
+            # inside one hipcc invocation; let the driver run them in parallel
+            flags_hip += [f"-parallel-jobs={len(archs)}"]
         flags_hip = sorted(set(flags_hip))  # remove same flags
         flags_hip = [el for el in flags_hip if hip_flag_checker(el)]
-        check_and_set_ninja_worker()
+        check_and_set_ninja_worker(len(archs))
 
         def exec_blob(blob_gen_cmd, op_dir, src_dir, sources):
             if blob_gen_cmd:
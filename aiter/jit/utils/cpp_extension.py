@@ -6,6 +6,7 @@
 # We make slight changes to enable ninja response file
 # mypy: allow-untyped-defs
 import copy
+import functools
 import importlib
 import importlib.abc
 import os
@@ -85,6 +86,7 @@ def executable_path(executable: str) -> str:
     return os.path.realpath(path)
 
 
+@functools.lru_cache(maxsize=1)
 def get_hip_version():
     try:
         hipconfig = executable_path("hipconfig")
@@ -247,6 +249,11 @@ def get_cxx_compiler():
     return os.environ.get("CXX", "c++")
 
 
+def get_compiler_launcher():
+    # e.g. "ccache" or "sccache"; prefixed to every compile command we emit
+    return os.environ.get("AITER_COMPILER_LAUNCHER", "").strip()
+
+
 def _is_binary_build() -> bool:
     import torch
 
@@ -286,9 +293,13 @@ def check_compiler_ok_for_platform(compiler: str) -> bool:
         True if the compiler is gcc/g++ on Linux or clang/clang++ on macOS,
         and always True for Windows.
     """
-    compiler_path = os.path.realpath(shutil.which(compiler))
-    if not compiler_path:
+    which_result = shutil.which(compiler)
+    if which_result is None and " " in compiler:
+        # launcher-prefixed string like "ccache g++"; check the real compiler
+        which_result = shutil.which(compiler.split()[-1])
+    if which_result is None:
         return False
+    compiler_path = os.path.realpath(which_result)
 
     # Check the compiler name
     if any(name in compiler_path for name in _accepted_compilers_for_platform()):
@@ -523,7 +534,9 @@ class BuildExtension(build_ext):
             try:
                 original_compiler = self.compiler.compiler_so
                 if _is_cuda_file(src):
-                    nvcc = [_join_rocm_home("bin", "hipcc")]
+                    nvcc = shlex.split(get_compiler_launcher()) + [
+                        _join_rocm_home("bin", "hipcc")
+                    ]
                     self.compiler.set_executable("compiler_so", nvcc)
                     if isinstance(cflags, dict):
                         cflags = cflags["nvcc"]
@@ -1654,12 +1667,17 @@ def _write_ninja_file(
     assert len(sources) > 0
 
     compiler = get_cxx_compiler()
+    launcher = get_compiler_launcher()
+    if launcher:
+        compiler = f"{launcher} {compiler}"
 
     # Version 1.3 is required for the `deps` directive.
     config = ["ninja_required_version = 1.3"]
     config.append(f"cxx = {compiler}")
     if with_cuda or cuda_dlink_post_cflags:
         nvcc = _join_rocm_home("bin", "hipcc")
+        if launcher:
+            nvcc = f"{launcher} {nvcc}"
         config.append(f"nvcc = {nvcc}")
 
     if IS_HIP_EXTENSION:
@@ -7,7 +7,6 @@ import os
 import subprocess
 from jinja2 import Template
 import ctypes
-from packaging.version import parse, Version
 from collections import OrderedDict
 from functools import lru_cache, partial
 import binascii
@@ -93,11 +92,18 @@ def mp_lock(
     return ret
 
 
+@lru_cache(maxsize=1)
 def get_hip_version():
+    """HIP version as a plain int tuple, e.g. (6, 2, 41133).
+
+    Tuples compare directly, so the flag gates in compile_lib don't need
+    packaging.version at all.
+    """
     version = subprocess.run(
         "/opt/rocm/bin/hipconfig --version", shell=True, capture_output=True, text=True
     )
-    return parse(version.stdout.split()[-1].rstrip("-").replace("-", "+"))
+    version = version.stdout.split()[-1].split("-")[0]
+    return tuple(int(x) for x in version.split(".")[:3])
 
 
 @lru_cache()
@@ -114,13 +120,16 @@ def validate_and_update_archs():
     archs = GPU_ARCH.split(";")
     archs = [arch.strip().split(":")[0] for arch in archs]
     # List of allowed architectures
+    # (gfx940/gfx941 were pre-production parts, build gfx942 instead)
     allowed_archs = [
         "native",
         "gfx90a",
-        "gfx940",
-        "gfx941",
         "gfx942",
         "gfx950",
+        "gfx1100",
+        "gfx1101",
+        "gfx1102",
+        "gfx1201",
     ]
 
     # Validate if each element in archs is in allowed_archs
@@ -176,7 +185,6 @@ def compile_lib(src_file, folder, includes=None, sources=None, cxxflags=None):
             "-D__HIP_PLATFORM_AMD__=1",
             "-U__HIP_NO_HALF_CONVERSIONS__",
             "-U__HIP_NO_HALF_OPERATORS__",
-            "-mllvm --amdgpu-kernarg-preload-count=16",
             "-Wno-unused-result",
             "-Wno-switch-bool",
             "-Wno-vla-cxx-extension",
@@ -195,29 +203,31 @@ def compile_lib(src_file, folder, includes=None, sources=None, cxxflags=None):
 
         # Imitate https://github.com/ROCm/composable_kernel/blob/c8b6b64240e840a7decf76dfaa13c37da5294c4a/CMakeLists.txt#L190-L214
         hip_version = get_hip_version()
-        if hip_version > Version("5.5.00000"):
+        if hip_version > (5, 5, 0):
             cxxflags += ["-mllvm --lsr-drop-solution=1"]
-        if hip_version > Version("5.7.23302"):
+        if hip_version > (5, 7, 23302):
             cxxflags += ["-fno-offload-uniform-block"]
-        if hip_version > Version("6.1.40090"):
+        if hip_version > (6, 1, 40090):
             cxxflags += ["-mllvm -enable-post-misched=0"]
-        if hip_version > Version("6.2.41132"):
-            cxxflags += [
-                "-mllvm -amdgpu-early-inline-all=true",
-                "-mllvm -amdgpu-function-calls=false",
-            ]
-        if hip_version > Version("6.2.41133"):
+        if hip_version > (6, 2, 41133):
             cxxflags += ["-mllvm -amdgpu-coerce-illegal-types=1"]
         archs = validate_and_update_archs()
         cxxflags += [f"--offload-arch={arch}" for arch in archs]
+        if len(archs) > 1:
+            # a fat multi-arch compile runs the per-arch device passes serially
+            # inside one hipcc invocation; let the driver run them in parallel
+            cxxflags += [f"-parallel-jobs={len(archs)}"]
         cxxflags = [flag for flag in set(cxxflags) if hip_flag_checker(flag)]
         makefile_file = makefile_template.render(
             includes=[f"-I{include_dir}"], sources=sources, cxxflags=cxxflags
         )
         with open(f"{sub_build_dir}/Makefile", "w") as f:
             f.write(makefile_file)
+        # each job compiles len(archs) device passes in parallel, so divide
+        # the make job count by the same factor to keep the footprint flat
+        make_jobs = max(1, len(sources) // max(1, len(archs)))
         subprocess.run(
-            f"cd {sub_build_dir} && make build -j{len(sources)}",
+            f"cd {sub_build_dir} && make build -j{make_jobs}",
             shell=True,
             capture_output=AITER_LOG_MORE < 2,
             check=True,
@@ -0,0 +1,31 @@
+// SPDX-License-Identifier: MIT
+// Copyright (C) 2024-2025, Advanced Micro Devices, Inc. All rights reserved.
+
+// Single pybind module exposing both the rocBLAS and hipBLASLt solution-index
+// GEMMs. rocsolgemm.cu and hipbsolgemm.cu are compiled into the same extension
+// with PREBUILD_KERNELS defined so their per-TU modules are suppressed.
+
+#include "hipbsolgemm.cuh"
+#include "rocsolgemm.cuh"
+
+PYBIND11_MODULE(TORCH_EXTENSION_NAME, m)
+{
+  m.def("hipb_create_extension", &hipb_create_extension, "create_extension");
+  m.def("hipb_destroy_extension", &hipb_destroy_extension, "destroy_extension");
+  m.def("hipb_mm", &hipb_mm, "hipb_mm", py::arg("mat1"), py::arg("mat2"),
+        py::arg("solution_index"), py::arg("bias") = std::nullopt,
+        py::arg("out_dtype") = std::nullopt, py::arg("scaleA") = std::nullopt,
+        py::arg("scaleB") = std::nullopt, py::arg("scaleOut") = std::nullopt,
+        py::arg("bpreshuffle") = std::nullopt);
+  m.def("hipb_findallsols", &hipb_findallsols, "hipb_findallsols",
+        py::arg("mat1"), py::arg("mat2"), py::arg("bias") = std::nullopt,
+        py::arg("out_dtype") = std::nullopt, py::arg("scaleA") = std::nullopt,
+        py::arg("scaleB") = std::nullopt, py::arg("scaleC") = std::nullopt,
+        py::arg("bpreshuffle") = false);
+  m.def("getHipblasltKernelName", &getHipblasltKernelName);
+
+  m.def("rocb_create_extension", &rocb_create_extension, "create_extension");
+  m.def("rocb_destroy_extension", &rocb_destroy_extension, "destroy_extension");
+  m.def("rocb_mm", &RocSolIdxBlas, "mm");
+  m.def("rocb_findallsols", &RocFindAllSolIdxBlas, "rocblas_find_all_sols");
+}
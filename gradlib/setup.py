@@ -16,6 +16,7 @@
 """
 
 import os
+import shutil
 import sys
 import torch
 from setuptools import setup
@@ -29,17 +30,33 @@ from jit.utils.cpp_extension import (
 from jit.utils.hipify import hipify_python
 
 this_dir = os.path.dirname(os.path.abspath(__file__))
+
+# wrap compilers with ccache when available; the vendored cpp_extension
+# prefixes every hipcc/c++ invocation with AITER_COMPILER_LAUNCHER
+if shutil.which("ccache") and "AITER_NO_CCACHE" not in os.environ:
+    os.environ.setdefault("AITER_COMPILER_LAUNCHER", "ccache")
+    os.environ.setdefault(
+        "CCACHE_SLOPPINESS", "pch_defines,time_macros,include_file_mtime"
+    )
+    os.environ.setdefault("CCACHE_COMPILERCHECK", "content")
 # gpus = subprocess.check_output("/opt/rocm/bin/rocminfo").decode(
 #           'UTF-8').split('\n')
 # gpus = list(set([re.search('(gfx94.)', g).group(0)
 #            for g in gpus if 'gfx94' in g]))
-gpus = ["gfx90a", "gfx940", "gfx941", "gfx942"]
+# gfx940/gfx941 were pre-production parts, gfx942 covers those GPUs
+gpus = ["gfx90a", "gfx942"]
 # gpus = ['gfx90a','gfx940']
 extra_args = ["--offload-arch=" + g for g in gpus]
+if len(gpus) > 1:
+    # parallelize the per-arch device compiles inside each hipcc invocation
+    extra_args += [f"-parallel-jobs={len(gpus)}"]
+
+# parse torch.__version__ once; reused for every version-gated flag below
+TORCH_MAJOR = int(torch.__version__.split(".")[0])
+TORCH_MINOR = int(torch.__version__.split(".")[1])
 
 # sets_rocm_pytorch = False
-maj_ver, min_ver, *_ = torch.__version__.split(".")
-if int(maj_ver) > 1 or (int(maj_ver) == 1 and int(min_ver) >= 5):
+if TORCH_MAJOR > 1 or (TORCH_MAJOR == 1 and TORCH_MINOR >= 5):
     from jit.utils.cpp_extension import ROCM_HOME
 
     is_rocm_pytorch = bool(torch.version.hip is not None and ROCM_HOME is not None)
@@ -52,8 +69,6 @@ if os.path.exists(os.path.join(torch_dir, "include", "ATen", "CUDAGenerator.h"))
     generator_flag = ["-DOLD_GENERATOR"]
 
 print("\n\ntorch.__version__  = {}\n\n".format(torch.__version__))
-TORCH_MAJOR = int(torch.__version__.split(".")[0])
-TORCH_MINOR = int(torch.__version__.split(".")[1])
 
 version_ge_1_1 = []
 if (TORCH_MAJOR > 1) or (TORCH_MAJOR == 1 and TORCH_MINOR > 0):
@@ -148,49 +163,39 @@ elif is_rocm_pytorch:
         #                }
         #            )
         #        )
+        nvcc_flags = [
+            "-O3",
+            "-U__CUDA_NO_HALF_OPERATORS__",
+            "-U__CUDA_NO_HALF_CONVERSIONS__",
+            "-ftemplate-depth=1024",
+            "-DLEGACY_HIPBLAS_DIRECT=ON",
+            # suppress the per-TU PYBIND11_MODULE blocks in
+            # rocsolgemm.cu/hipbsolgemm.cu; aiter_gemm.cu binds both
+            "-DPREBUILD_KERNELS",
+        ] + extra_args
+        # keep only the FP8 define conditional; the rest of the flags must
+        # stay regardless of whether this torch build has fp8 dtypes
+        if hasattr(torch, "float8_e4m3fnuz"):
+            nvcc_flags.append("-DENABLE_TORCH_FP8")
+        # one extension for both GEMM backends: a single hipcc/link pays the
+        # CK/torch header parse once instead of once per module
         ext_modules.append(
             CUDAExtension(
-                name="rocsolidxgemm",
-                sources=["./csrc/rocsolgemm.cu"],
-                include_dirs=include_dirs,
-                # add additional libraries argument for hipblaslt
-                libraries=["rocblas"],
-                extra_compile_args={
-                    "cxx": [
-                        "-O3",
-                        "-DLEGACY_HIPBLAS_DIRECT=ON",
-                    ],
-                    "nvcc": [
-                        "-O3",
-                        "-U__CUDA_NO_HALF_OPERATORS__",
-                        "-U__CUDA_NO_HALF_CONVERSIONS__",
-                        "-ftemplate-depth=1024",
-                        "-DLEGACY_HIPBLAS_DIRECT=ON",
-                    ]
-                    + extra_args,
-                },
-            )
-        )
-        ext_modules.append(
-            CUDAExtension(
-                name="hipbsolidxgemm",
-                sources=["./csrc/hipbsolgemm.cu"],
-                include_dirs=include_dirs,
+                name="aiter_gemm",
+                sources=[
+                    "./csrc/aiter_gemm.cu",
+                    "./csrc/rocsolgemm.cu",
+                    "./csrc/hipbsolgemm.cu",
+                ],
+                include_dirs=include_dirs + [os.path.join(this_dir, "include")],
                 # add additional libraries argument for hipblaslt
-                libraries=["hipblaslt"],
+                libraries=["rocblas", "hipblaslt"],
                 extra_compile_args={
                     "cxx": [
                         "-O3",
                         "-DLEGACY_HIPBLAS_DIRECT=ON",
                     ],
-                    "nvcc": [
-                        "-O3",
-                        "-U__CUDA_NO_HALF_OPERATORS__",
-                        "-U__CUDA_NO_HALF_CONVERSIONS__",
-                        "-ftemplate-depth=1024",
-                        "-DLEGACY_HIPBLAS_DIRECT=ON",
-                    ]
-                    + extra_args,
+                    "nvcc": nvcc_flags,
                 },
             )
         )
@@ -21,29 +21,42 @@ PACKAGE_NAME = "aiter"
 BUILD_TARGET = os.environ.get("BUILD_TARGET", "auto")
 
 if BUILD_TARGET == "auto":
-    if IS_HIP_EXTENSION:
-        IS_ROCM = True
-    else:
-        IS_ROCM = False
+    IS_ROCM = IS_HIP_EXTENSION
+elif BUILD_TARGET in ("cuda", "rocm"):
+    IS_ROCM = BUILD_TARGET == "rocm"
 else:
-    if BUILD_TARGET == "cuda":
-        IS_ROCM = False
-    elif BUILD_TARGET == "rocm":
-        IS_ROCM = True
+    # fail right away instead of a NameError on IS_ROCM further down
+    raise ValueError(
+        f'BUILD_TARGET={BUILD_TARGET} is invalid, expected "auto", "cuda" or "rocm"'
+    )
 
 FORCE_CXX11_ABI = False
 
 PREBUILD_KERNELS = int(os.environ.get("PREBUILD_KERNELS", 0))
 
+# wrap compilers with ccache when available so unchanged template-heavy CK TUs
+# are served from cache on rebuilds; the jit builder prefixes every hipcc/c++
+# invocation with AITER_COMPILER_LAUNCHER (must be set before the prebuild
+# compiles below)
+if shutil.which("ccache") and "AITER_NO_CCACHE" not in os.environ:
+    os.environ.setdefault("AITER_COMPILER_LAUNCHER", "ccache")
+    # header-only CK edits shouldn't invalidate unrelated TUs
+    os.environ.setdefault(
+        "CCACHE_SLOPPINESS", "pch_defines,time_macros,include_file_mtime"
+    )
+    os.environ.setdefault("CCACHE_COMPILERCHECK", "content")
+
 
 def getMaxJobs():
+    # cores/memory as seen by the cgroup we run in, not the whole host
+    cores, free_memory_gb = core.get_effective_limits()
+
     # calculate the maximum allowed NUM_JOBS based on cores
-    max_num_jobs_cores = max(1, os.cpu_count() * 0.8)
-    import psutil
+    max_num_jobs_cores = max(1, cores * 0.8)
 
     # calculate the maximum allowed NUM_JOBS based on free memory
-    free_memory_gb = psutil.virtual_memory().available / (1024**3)  # free memory in GB
-    max_num_jobs_memory = int(free_memory_gb / 0.5)  # assuming 0.5 GB per job
+    gb_per_job = float(os.environ.get("AITER_JOB_RSS_GB", "0.5"))
+    max_num_jobs_memory = int(free_memory_gb / gb_per_job)
 
     # pick lower value of jobs based on cores vs memory metric to minimize oom and swap usage during compilation
     max_jobs = int(max(1, min(max_num_jobs_cores, max_num_jobs_memory)))
@@ -91,38 +104,103 @@ if IS_ROCM:
         all_opts_args_build, prebuild_link_param = core.get_args_of_build(
             "all", exclude=exclude_ops
         )
-        os.system(f"rm -rf {core.get_user_jit_dir()}/build")
-        os.system(f"rm -rf {core.get_user_jit_dir()}/*.so")
-        prebuild_dir = f"{core.get_user_jit_dir()}/build/aiter_/build"
-        os.makedirs(prebuild_dir + "/srcs")
-
-        def build_one_module(one_opt_args):
-            core.build_module(
-                md_name=one_opt_args["md_name"],
-                srcs=one_opt_args["srcs"],
-                flags_extra_cc=one_opt_args["flags_extra_cc"],
-                flags_extra_hip=one_opt_args["flags_extra_hip"],
-                blob_gen_cmd=one_opt_args["blob_gen_cmd"],
-                extra_include=one_opt_args["extra_include"],
-                extra_ldflags=None,
-                verbose=False,
-                is_python_module=True,
-                is_standalone=False,
-                torch_exclude=False,
-            )
-
-        # step 1, build *.cu -> module*.so
-        prebuid_thread_num = 5
-        # Respect MAX_JOBS environment variable, fallback to auto-calculation
-        max_jobs = os.environ.get("MAX_JOBS")
-        if max_jobs is not None and max_jobs.isdigit() and int(max_jobs) > 0:
-            prebuid_thread_num = min(prebuid_thread_num, int(max_jobs))
-        else:
-            prebuid_thread_num = min(prebuid_thread_num, getMaxJobs())
-        os.environ["PREBUILD_THREAD_NUM"] = str(prebuid_thread_num)
 
-        with ThreadPoolExecutor(max_workers=prebuid_thread_num) as executor:
-            list(executor.map(build_one_module, all_opts_args_build))
+        def get_prebuild_key():
+            # hash everything the prebuilt .so files depend on — build args,
+            # source/header mtimes (recursing into directory srcs), the CK
+            # submodule revision, target archs and HIP/torch versions — so a
+            # no-op reinstall can skip the rebuild below without ever reusing
+            # wrong-arch or ABI-mismatched kernels
+            import hashlib
+            import subprocess
+
+            import torch
+
+            def walk_mtimes(path):
+                if os.path.isdir(path):
+                    for cur_dir, _, files in os.walk(path):
+                        for f in files:
+                            yield os.stat(os.path.join(cur_dir, f)).st_mtime
+                elif os.path.exists(path):
+                    yield os.stat(path).st_mtime
+
+            mtimes = []
+            for one_opt_args in all_opts_args_build:
+                for src in one_opt_args["srcs"]:
+                    mtimes += walk_mtimes(src)
+            mtimes += walk_mtimes(f"{this_dir}/csrc/include")
+            try:
+                ck_state = subprocess.check_output(
+                    ["git", "-C", ck_dir, "rev-parse", "HEAD"],
+                    text=True,
+                    stderr=subprocess.DEVNULL,
+                ).strip()
+            except (OSError, subprocess.SubprocessError):
+                # not a git checkout; fall back to walking the tree
+                ck_state = str(sorted(walk_mtimes(ck_dir)))
+            key_parts = [
+                repr(all_opts_args_build),
+                str(sorted(mtimes)),
+                ck_state,
+                str(core.validate_and_update_archs()),
+                str(core.get_hip_version_tuple()),
+                torch.__version__,
+            ]
+            return hashlib.blake2b("|".join(key_parts).encode()).hexdigest()
+
+        jit_dir = core.get_user_jit_dir()
+        prebuild_key = get_prebuild_key()
+        prebuild_key_file = f"{jit_dir}/build/.prebuild.key"
+        prebuilt_sos = [
+            f"{jit_dir}/{one_opt_args['md_name']}.so"
+            for one_opt_args in all_opts_args_build
+        ]
+        try:
+            with open(prebuild_key_file, "r") as f:
+                prebuild_uptodate = f.read().strip() == prebuild_key and all(
+                    os.path.exists(so) for so in prebuilt_sos
+                )
+        except FileNotFoundError:
+            prebuild_uptodate = False
+
+        if prebuild_uptodate:
+            print("prebuilt kernels are up-to-date, skip regeneration")
+        else:
+            os.system(f"rm -rf {jit_dir}/build")
+            os.system(f"rm -rf {jit_dir}/*.so")
+            prebuild_dir = f"{jit_dir}/build/aiter_/build"
+            os.makedirs(prebuild_dir + "/srcs")
+
+            def build_one_module(one_opt_args):
+                core.build_module(
+                    md_name=one_opt_args["md_name"],
+                    srcs=one_opt_args["srcs"],
+                    flags_extra_cc=one_opt_args["flags_extra_cc"],
+                    flags_extra_hip=one_opt_args["flags_extra_hip"],
+                    blob_gen_cmd=one_opt_args["blob_gen_cmd"],
+                    extra_include=one_opt_args["extra_include"],
+                    extra_ldflags=None,
+                    verbose=False,
+                    is_python_module=True,
+                    is_standalone=False,
+                    torch_exclude=False,
+                )
+
+            # step 1, build *.cu -> module*.so
+            prebuid_thread_num = 5
+            # Respect MAX_JOBS environment variable, fallback to auto-calculation
+            max_jobs = os.environ.get("MAX_JOBS")
+            if max_jobs is not None and max_jobs.isdigit() and int(max_jobs) > 0:
+                prebuid_thread_num = min(prebuid_thread_num, int(max_jobs))
+            else:
+                prebuid_thread_num = min(prebuid_thread_num, getMaxJobs())
+            os.environ["PREBUILD_THREAD_NUM"] = str(prebuid_thread_num)
+
+            with ThreadPoolExecutor(max_workers=prebuid_thread_num) as executor:
+                list(executor.map(build_one_module, all_opts_args_build))
+
+            with open(prebuild_key_file, "w") as f:
+                f.write(prebuild_key)
 
 else:
     raise NotImplementedError("Only ROCM is supported")
@@ -130,11 +208,17 @@ else:
 
 if os.path.exists("aiter_meta") and os.path.isdir("aiter_meta"):
     shutil.rmtree("aiter_meta")
-## link "3rdparty", "hsa", "csrc" into "aiter_meta"
-shutil.copytree("3rdparty", "aiter_meta/3rdparty")
-shutil.copytree("hsa", "aiter_meta/hsa")
-shutil.copytree("gradlib", "aiter_meta/gradlib")
-shutil.copytree("csrc", "aiter_meta/csrc")
+## link "3rdparty", "hsa", "gradlib", "csrc" into "aiter_meta"
+# symlinks instead of a physical copy: 3rdparty holds the whole CK submodule
+# and copying it on every invocation costs minutes; setuptools follows the
+# links when collecting package data (MANIFEST.in grafts aiter_meta)
+os.makedirs("aiter_meta", exist_ok=True)
+for tree in ("3rdparty", "hsa", "gradlib", "csrc"):
+    os.symlink(
+        os.path.join(this_dir, tree),
+        os.path.join("aiter_meta", tree),
+        target_is_directory=True,
+    )
 
 
 class NinjaBuildExtension(BuildExtension):